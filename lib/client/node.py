@@ -166,7 +166,7 @@ class Node(object):
             if address.lower() == "localhost":
                 self.localhost = True
             else:
-                o, e = util.shell_command(["hostname -I"])
+                o, e = util.shell_command(["hostname", "-I"], shell=False)
                 self.localhost = self._is_any_my_ip(o.split())
         except Exception:
             pass
@@ -189,6 +189,8 @@ class Node(object):
         return False
 
     def connect(self, address, port):
+        # Failures cached before this (re)connect must not decide it.
+        util.forget_failures(self)
         try:
             if not self.login():
                 raise IOError("Login Error")
@@ -281,6 +283,8 @@ class Node(object):
 
         self.session_token, self.session_expiration = sock.get_session_info()
         self.perform_login = False
+        # Calls which failed on the expired session may succeed now.
+        util.forget_failures(self)
         return True
 
     @property
@@ -12,12 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
 import itertools
+import logging
+import re
+import sys
 import threading
+from multiprocessing.pool import ThreadPool
 from time import time
 import subprocess
-import pipes
+
+# Worker threads shared by all concurrent_map calls, created on first use.
+# Workers block on node sockets rather than the CPU, so the pool is sized
+# for a large cluster instead of following cpu_count. Idle threads are
+# cheap, and a smaller pool would query the nodes in waves.
+_MAX_POOL_SIZE = 256
+_pool = None
+_pool_lock = threading.Lock()
+_pool_worker = threading.local()
+
+# Compiled patterns for multi-character info_to_list delimiters.
+_SPLIT_PATTERNS = {}
+
+_MISSING = object()
+
+_DNS_NAME = re.compile(r'(?![\[\d])([^:]*)')
 
 
 def info_to_dict(value, delimiter=';', ignore_field_without_key_value_delimiter=True):
@@ -60,21 +78,25 @@ def info_to_dict(value, delimiter=';', ignore_field_without_key_value_delimiter=
             else:
                 _value_list.append(_v)
 
-    stat_param = itertools.imap(lambda sp: info_to_tuple(sp, delimiter2),
-                                _value_list)
+    # Keys are almost always unique, so store values directly and collect
+    # only repeated keys separately.
+    duplicates = None
+    for _v in _value_list:
+        key, sep, val = _v.partition(delimiter2)
+        if not sep:
+            # NOTE: 3.0 had a bug in stats at least prior to 3.0.44 which
+            # returns fields without key-value delimiter. Ignore those.
+            continue
+        if key in stat_dict:
+            if duplicates is None:
+                duplicates = {}
+            duplicates.setdefault(key, [stat_dict[key]]).append(val)
+        stat_dict[key] = val
 
-    for g in itertools.groupby(stat_param, lambda x: x[0]):
-        try:
-            value = map(lambda v: v[1], g[1])
-            value = ",".join(sorted(value)) if len(value) > 1 else value[0]
-            stat_dict[g[0]] = value
-        except Exception:
-            # NOTE: 3.0 had a bug in stats at least prior to 3.0.44. This will
-            # ignore that bug.
+    if duplicates:
+        for key, values in duplicates.iteritems():
+            stat_dict[key] = ",".join(sorted(values))
 
-            # Not sure if this bug is fixed or not.. removing this try/catch
-            # results in things not working. TODO: investigate.
-            pass
     return stat_dict
 
 
@@ -102,10 +124,16 @@ def info_to_dict_multi_level(value, keyname, delimiter1=';', delimiter2=':', ign
             v, delimiter2, ignore_field_without_key_value_delimiter=ignore_field_without_key_value_delimiter)
         if not values or isinstance(values, Exception):
             continue
+        if len(keyname) == 1:
+            _v = values.get(keyname[0])
+            if _v is not None:
+                value_dict[_v] = values
+            continue
+
         for _k in keyname:
-            if _k not in values.keys():
-                continue
-            value_dict[values[_k]] = values
+            _v = values.get(_k)
+            if _v is not None:
+                value_dict[_v] = values
     return value_dict
 
 
@@ -119,11 +147,20 @@ def info_colon_to_dict(value):
 def info_to_list(value, delimiter=";"):
     if isinstance(value, Exception):
         return []
-    return re.split(delimiter, value)
+    if len(delimiter) == 1:
+        return value.split(delimiter)
+
+    # Longer delimiters keep their regular expression semantics.
+    pattern = _SPLIT_PATTERNS.get(delimiter)
+    if pattern is None:
+        pattern = _SPLIT_PATTERNS[delimiter] = re.compile(delimiter)
+    return pattern.split(value)
 
 
 def info_to_tuple(value, delimiter=":"):
-    return tuple(info_to_list(value, delimiter))
+    if isinstance(value, Exception):
+        return ()
+    return tuple(value.split(delimiter))
 
 
 def find_dns(endpoints):
@@ -133,12 +170,10 @@ def find_dns(endpoints):
     for e in endpoints:
         if not e:
             continue
-        if e.startswith("[") or e[0].isdigit():
-            continue
-        try:
-            return e.split(":")[0].strip()
-        except Exception:
-            pass
+        # Skips IPv6 ([...]) and IPv4 endpoints, returns the host part.
+        m = _DNS_NAME.match(e)
+        if m:
+            return m.group(1).strip()
     return None
 
 
@@ -153,87 +188,154 @@ def parse_peers_string(s, delim=",", ignore_chars_start="[", ignore_chars_end="]
         s = s[1:-1]
     if not s:
         return o
-    push_bracket = ignore_chars_start
-    pop_bracket = ignore_chars_end
+    if not any(c in s for c in ignore_chars_start):
+        # Nothing nested, every delimiter separates a field.
+        o = [v.strip() for v in s.split(delim)]
+        if s.endswith(delim):
+            o.pop()
+        return o
+    push_bracket = frozenset(ignore_chars_start)
+    pop_bracket = frozenset(ignore_chars_end)
     b_stack = []
-    current_str = ""
-    for i in s:
+    start = 0
+    for idx, i in enumerate(s):
         if i == delim:
-            if len(b_stack) > 0:
-                current_str += i
-            else:
-                o.append(current_str.strip())
-                current_str = ""
+            if len(b_stack) == 0:
+                o.append(s[start:idx].strip())
+                start = idx + 1
             continue
         if i in push_bracket:
-            current_str += i
             b_stack.append(i)
             continue
         if i in pop_bracket:
-            current_str += i
             b_stack.pop()
-            continue
-        current_str += i
-    if current_str:
-        o.append(current_str.strip())
+    if start < len(s):
+        o.append(s[start:].strip())
     return o
 
 
+def _mark_pool_worker():
+    _pool_worker.active = True
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPool(processes=_MAX_POOL_SIZE,
+                                   initializer=_mark_pool_worker)
+    return _pool
+
+
 def concurrent_map(func, data):
     """
-    Similar to the builtin function map(). But spawn a thread for each argument
-    and apply 'func' concurrently.
+    Similar to the builtin function map(). But apply 'func' concurrently on a
+    shared pool of worker threads. At most _MAX_POOL_SIZE calls run at a
+    time, a worker picks up the next argument as soon as it is done.
 
-    Note: unlie map(), we cannot take an iterable argument. 'data' should be an
-    indexable sequence.
+    Note: Results are in the same order as 'data'. If 'func' raises for an
+    argument then the result for that argument is None. Unlike map(), we
+    cannot take an iterable argument, 'data' should be an indexable sequence.
     """
 
-    N = len(data)
-    result = [None] * N
-
     # Uncomment following line to run single threaded.
     # return [func(datum) for datum in data]
 
-    # wrapper to dispose the result in the right slot
-    def task_wrapper(i):
-        result[i] = func(data[i])
+    def task_wrapper(datum):
+        try:
+            return func(datum)
+        except Exception:
+            # A dead thread used to print its traceback, keep failures visible.
+            logging.getLogger('asadm').exception(
+                "concurrent_map: %s failed for %r" % (
+                    getattr(func, '__name__', func), datum))
+            return None
+
+    # Info calls go over blocking (and optionally TLS) sockets, so overlap
+    # comes from threads. With a single argument there is nothing to
+    # overlap, run it on the calling thread.
+    if len(data) <= 1 or getattr(_pool_worker, 'active', False):
+        # Called from a pool worker, waiting on the same pool may deadlock.
+        return map(task_wrapper, data)
 
-    threads = [
-        threading.Thread(target=task_wrapper, args=(i,)) for i in xrange(N)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    # chunksize=1 so one slow node only holds up its own slot.
+    return _get_pool().map(task_wrapper, data, chunksize=1)
 
-    return result
+
+# Remembered failures by the first argument of the call (the Node for info
+# calls), so forget_failures does not have to scan the caches.
+_failed_calls = {}
 
 
 class cached(object):
     # Doesn't support lists, dicts and other unhashables
     # Also doesn't support kwargs for reason above.
-
-    def __init__(self, func, ttl=0.5):
+    # Failed calls are remembered for miss_ttl (default ttl/4). Until then
+    # the same exception instance is raised again, without calling func, to
+    # every caller with the same args, from any thread. Only the exception is
+    # kept, not its traceback, so the failed call's frames are not held
+    # alive. forget_failures() drops them early, e.g. when a node reconnects.
+    # Successful calls which took less than min_cost seconds are not cached,
+    # recomputing them is cheaper than keeping them around. Off by default:
+    # with it, two reads inside one ttl may see different values.
+
+    def __init__(self, func, ttl=0.5, miss_ttl=None, min_cost=0):
         self.func = func
         self.ttl = ttl
+        self.miss_ttl = ttl / 4.0 if miss_ttl is None else miss_ttl
+        self.min_cost = min_cost
         self.cache = {}
 
-    def __setitem__(self, key, value):
-        self.cache[key] = (value, time() + self.ttl)
-
-    def __getitem__(self, key):
-        if key in self.cache:
-            value, eol = self.cache[key]
+    def __call__(self, *args):
+        try:
+            value, eol, exc = self.cache[args]
+        except KeyError:
+            pass
+        else:
             if eol > time():
-                return value
+                if exc is None:
+                    return value
+                raise exc
 
-        self[key] = self.func(*key)
-        return self.cache[key][0]
+        start = time()
+        try:
+            value = self.func(*args)
+        except Exception:
+            self.cache[args] = (None, time() + self.miss_ttl, sys.exc_info()[1])
+            if args:
+                _failed_calls.setdefault(args[0], set()).add((self, args))
+            raise
+
+        now = time()
+        if now - start >= self.min_cost:
+            self.cache[args] = (value, now + self.ttl, None)
+        return value
 
-    def __call__(self, *args):
-        return self[args]
+
+def forget_failures(first_arg):
+    """
+    Drop the remembered failures, in every cached function, of calls whose
+    first argument is first_arg.
+    """
+
+    for cache, args in _failed_calls.pop(first_arg, ()):
+        entry = cache.cache.get(args)
+        if entry is not None and entry[2] is not None:
+            cache.cache.pop(args, None)
 
 
 def flatten(list1):
+    if not list1:
+        return []
+
+    # Peers lists are normally uniform, either all groups or all endpoints.
+    nested = isinstance(list1[0][0], tuple)
+    if all(isinstance(i[0], tuple) == nested for i in list1):
+        if nested:
+            return list(itertools.chain.from_iterable(list1))
+        return list(list1)
+
     f_list = []
     for i in list1:
         if isinstance(i[0], tuple):
@@ -255,29 +357,37 @@ def remove_suffix(input_string, suffix):
 
 
 def get_value_from_dict(d, keys, default_value=None, return_type=None):
-    if not isinstance(keys, tuple):
-        keys = (keys,)
-    for key in keys:
-        if key in d:
-            val = d[key]
-            if return_type and val:
-                try:
-                    return return_type(val)
-                except:
-                    pass
-            return val
-    return default_value
+    if isinstance(keys, tuple):
+        val = _MISSING
+        for key in keys:
+            val = d.get(key, _MISSING)
+            if val is not _MISSING:
+                break
+    else:
+        val = d.get(keys, _MISSING)
+
+    if val is _MISSING:
+        return default_value
+
+    if return_type and val:
+        try:
+            return return_type(val)
+        except:
+            pass
+    return val
 
 
-def shell_command(command):
+def shell_command(command, shell=True):
     """
     command is a list of ['cmd','arg1','arg2',...]
+    With shell=False command is executed directly without a shell, so no
+    shell syntax (pipes, redirection, quoting) is interpreted.
     """
-    command = pipes.quote(" ".join(command))
-    command = ['sh', '-c', "'%s'" % (command)]
+    if shell:
+        command = " ".join(command)
     try:
         p = subprocess.Popen(
-            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            command, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
         out, err = p.communicate()
     except Exception:
@@ -538,8 +538,9 @@ def create_summary(service_stats, namespace_stats, set_stats, metadata,
 
         if ns_total_devices:
             summary_dict["FEATURES"]["NAMESPACE"][ns]["devices_total"] = ns_total_devices
-            summary_dict["FEATURES"]["NAMESPACE"][ns]["devices_per_node"] = int(
-                (float(ns_total_devices) / float(ns_total_nodes)) + 0.5)
+            # Rounded half up with integer arithmetic
+            summary_dict["FEATURES"]["NAMESPACE"][ns]["devices_per_node"] = (
+                (2 * ns_total_devices + ns_total_nodes) // (2 * ns_total_nodes))
             if len(set(device_counts.values())) > 1:
                 summary_dict["FEATURES"]["NAMESPACE"][ns]["devices_count_same_across_nodes"] = False
 
@@ -617,7 +618,8 @@ def create_summary(service_stats, namespace_stats, set_stats, metadata,
     cl_device_counts = sum(cl_nodewise_device_counts.values())
     if cl_device_counts:
         summary_dict["CLUSTER"]["device"]["count"] = cl_device_counts
-        summary_dict["CLUSTER"]["device"]["count_per_node"] = int((float(cl_device_counts) / float(total_nodes)) + 0.5)
+        summary_dict["CLUSTER"]["device"]["count_per_node"] = (
+            (2 * cl_device_counts + total_nodes) // (2 * total_nodes))
         if len(set(cl_nodewise_device_counts.values())) > 1:
             summary_dict["CLUSTER"]["device"]["count_same_across_nodes"] = False
 
@@ -681,7 +683,7 @@ def _create_histogram_percentiles_output(histogram_name, histogram_data):
             if result == []:
                 result = [0] * 10
 
-            if histogram_name is "objsz":
+            if histogram_name == "objsz":
                 data['percentiles'] = [(r * width) - 1 if r > 0 else r for r in result]
             else:
                 data['percentiles'] = [r * width for r in result]
@@ -95,11 +95,26 @@ def capture_stdout(func, line=''):
     return output
 
 
+_compiled_likes = {}
+_COMPILED_LIKES_MAX = 128
+
+
 def compile_likes(likes):
-    likes = ["(" + like.translate(None, '\'"') + ")" for like in likes]
-    likes = "|".join(likes)
-    likes = re.compile(likes)
-    return likes
+    # Sorted so that the same likes given as a list, tuple or set in any
+    # order share one compiled pattern.
+    key = tuple(sorted(likes))
+    try:
+        return _compiled_likes[key]
+    except KeyError:
+        pass
+
+    pattern = "|".join(["(" + like.translate(None, '\'"') + ")"
+                        for like in key])
+    if len(_compiled_likes) >= _COMPILED_LIKES_MAX:
+        _compiled_likes.clear()
+    compiled = re.compile(pattern)
+    _compiled_likes[key] = compiled
+    return compiled
 
 
 def filter_list(ilist, pattern_list):
@@ -260,15 +275,25 @@ def get_value_from_dict(d, keys, default_value=None, return_type=None):
     """
 
     if not isinstance(keys, tuple):
-        keys = (keys,)
+        # Single key, skip wrapping it into a tuple
+        if keys not in d:
+            return default_value
+        value = d[keys]
+    else:
+        for key in keys:
+            if key in d:
+                value = d[key]
+                break
+        else:
+            return default_value
 
-    for key in keys:
-        if key in d:
-            val, success = _cast(d[key], return_type=return_type)
-            if success:
-                return val
+    if not return_type or value is None:
+        return value
+
+    val, success = _cast(value, return_type=return_type)
+    if success:
+        return val
 
-            return default_value
     return default_value
 
 
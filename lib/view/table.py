@@ -17,6 +17,8 @@ import re
 from lib.utils import filesize
 from lib.view import terminal
 
+_MISSING = object()
+
 
 class Extractors(object):
     # standard set of extractors
@@ -26,20 +28,19 @@ class Extractors(object):
         if not isinstance(columns, tuple):
             columns = (columns,)
 
+        if system == int:
+            convert = int
+        elif system == float:
+            convert = float
+        else:
+            convert = lambda value: filesize.size(int(value), system)
+
         def si_extractor(data):
-            found = False
             for column in columns:
-                if column in data:
-                    found = True
-                    break
-            if not found:
-                return "N/E"
-            if system == int:
-                return int(data[column])
-            elif system == float:
-                return float(data[column])
-            else:
-                return filesize.size(int(data[column]), system)
+                value = data.get(column, _MISSING)
+                if value is not _MISSING:
+                    return convert(value)
+            return "N/E"
 
         return si_extractor
 
@@ -70,10 +71,13 @@ class Extractors(object):
 
         def t_extractor(data):
             for column in columns:
-                if column in data:
+                value = data.get(column, _MISSING)
+                if value is not _MISSING:
                     break
+            else:
+                raise KeyError(column)
 
-            time_stamp = int(data[column])
+            time_stamp = int(value)
             hours = time_stamp / 3600
             minutes = (time_stamp % 3600) / 60
             seconds = time_stamp % 60
@@ -113,6 +117,7 @@ class Table(object):
         self._data_source = {}
         self._no_alert_style = lambda: ''
         self._cell_alert = {}
+        self._column_plan = None
         self._column_padding = "   "
         self._no_entry = 'N/E'
 
@@ -179,6 +184,12 @@ class Table(object):
 
     def add_data_source(self, column, function):
         self._data_source[column] = function
+        self._column_plan = None
+
+    def add_data_sources(self, sources):
+        for column, function in sources:
+            self._data_source[column] = function
+        self._column_plan = None
 
     def ignore_sort(self, ignore=True):
         self._need_sort = not ignore
@@ -201,9 +212,33 @@ class Table(object):
             return '(' + ','.join(args) + ')'.ljust(prior_trimmed + 1)
 
         self._data_source[column] = tuple_extractor
+        self._column_plan = None
 
     def add_cell_alert(self, column_name, is_alert, color=terminal.fg_red):
         self._cell_alert[column_name] = (is_alert, color)
+        self._column_plan = None
+
+    def add_cell_alerts(self, alerts):
+        for column_name, is_alert, color in alerts:
+            self._cell_alert[column_name] = (is_alert, color)
+        self._column_plan = None
+
+    def _get_column_plan(self):
+        # Resolve each column's extractor and alert once rather than probing
+        # both dicts for every cell of every inserted row.
+        if self._column_plan is None:
+            self._column_plan = [
+                (i, column, self._data_source.get(column),
+                 self._cell_alert.get(column, (None, None)))
+                for i, column in enumerate(self._column_names)]
+        return self._column_plan
+
+    def insert_rows(self, rows):
+        # Rows may come from a generator, each source dict can be dropped
+        # as soon as its cells are extracted.
+        insert_row = self.insert_row
+        for row_data in rows:
+            insert_row(row_data)
 
     def insert_row(self, row_data):
         if not row_data:
@@ -213,38 +248,33 @@ class Table(object):
         if type(row_data) is not dict:
             raise ValueError("Data cannot be of type %s" % type(row_data))
 
-        for i, column in enumerate(self._column_names):
+        no_alert_style = self._no_alert_style
+        render_column_ids = self._render_column_ids
+        for i, column, extractor, (is_alert, color) in self._get_column_plan():
             try:
-                if column in self._data_source:
-                    extractor = self._data_source[column]
+                if extractor is not None:
                     cell = extractor(row_data)
                 else:
                     cell = row_data[column]
                 # column has actual data, let it render
-                self._render_column_ids.add(i)
+                render_column_ids.add(i)
             except KeyError:  # extractor accessed n/e column
                 cell = self._no_entry
 
-            try:
-                is_alert = False
-                if column in self._cell_alert:
-                    is_alert, color = self._cell_alert[column]
-
-                if is_alert and is_alert(row_data):
-                    cell = (color, cell)
-                else:
-                    cell = (self._no_alert_style, cell)
-            except KeyError:  # is_alert accessed n/e column
-                cell = (self._no_alert_style, cell)
-
-            row.append(cell)
+            cell_format = no_alert_style
+            if is_alert:
+                try:
+                    if is_alert(row_data):
+                        cell_format = color
+                except KeyError:  # is_alert accessed n/e column
+                    pass
 
-        for i, (cell_format, cell) in enumerate(row):
             if isinstance(cell, Exception):
                 cell = "error"
             else:
                 cell = str(cell)
-            row[i] = (cell_format, cell)
+            row.append((cell_format, cell))
+
         self._data.append(row)
         self._update_column_metadata(row)
         self._need_sort = True
@@ -428,22 +458,32 @@ class Table(object):
     def _str_horizontal(self, title_every_nth=0):
         output = []
         output.append(self._get_horizontal_header(title_every_nth=title_every_nth))
+        no_alert_style = self._no_alert_style
+        # Terminal styles are stateful, so alert colors cannot be rendered
+        # ahead of time. Clearing is idempotent though: reuse the last clear
+        # sequence until a cell actually applies a color.
+        clear = None
         for drow in self._data:
             row = []
             title_cell_format = drow[0][0]
             title_cell = self._format_cell(drow[0][1], 0)
 
             for i, (cell_format, cell) in enumerate(drow):
-                row.append(terminal.style(
-                    terminal.bg_clear, terminal.fg_clear))
+                if clear is None:
+                    clear = terminal.style(terminal.bg_clear, terminal.fg_clear)
+                row.append(clear)
                 if i not in self._render_column_ids:
                     continue
 
                 i = self._render_remap[i]
                 if title_every_nth and i-1 > 0 and (i-1)%title_every_nth == 0:
+                    if title_cell_format is not no_alert_style:
+                        clear = None
                     row.append("%s%s" % (title_cell_format(), title_cell))
                     row.append(self._column_padding)
 
+                if cell_format is not no_alert_style:
+                    clear = None
                 cell = self._format_cell(cell, i)
                 row.append("%s%s" % (cell_format(), cell))
                 row.append(self._column_padding)
@@ -493,6 +533,9 @@ class Table(object):
         output.extend(
             self.gen_description(sum(title_width), sum(title_width) - 10))
 
+        no_alert_style = self._no_alert_style
+        column_widths = self._render_column_widths
+        padding = self._column_padding
         for i, column_name in enumerate(self._render_column_names):
 
             row = []
@@ -516,9 +559,12 @@ class Table(object):
                         column_title.ljust(self._render_column_widths[0]))
                     row.append(":")
                     row.append(self._column_padding)
-                cell = cell.ljust(self._render_column_widths[j])
-                row.append("%s%s" % (cell_format(), cell))
-                row.append(self._column_padding)
+                cell = cell.ljust(column_widths[j])
+                if cell_format is no_alert_style:
+                    row.append(cell)
+                else:
+                    row.append("%s%s" % (cell_format(), cell))
+                row.append(padding)
                 added_columns += 1
 
             if column_name == "NODE":
@@ -15,9 +15,11 @@
 import datetime
 import itertools
 import locale
+import re
 import sys
 import time
 import types
+from collections import defaultdict
 from cStringIO import StringIO
 from pydoc import pipepager
 
@@ -35,6 +37,246 @@ H1_offset = 13
 H2_offset = 15
 H_width = 80
 
+# An escape sequence runs up to and including its terminating 'm'.
+_OUTPUT_GROUP = re.compile(r'\033[^m]*m?|.', re.DOTALL)
+
+# Loose shape of a DT_FMT timestamp, only keys matching it are handed to
+# strptime.
+_DT_KEY = re.compile(
+    r'\s*\S+\s+\d{1,2}\s+\d{4}\s+\d{1,2}:\d{1,2}:\d{1,2}$', re.UNICODE)
+
+# Column extractors and alerts which do not depend on call arguments are
+# built once here and only registered with each Table.
+_NETWORK_SOURCES = (
+    ('Enterprise', lambda data: 'N/E' if data['version'] == 'N/E' else(
+        "Enterprise" in data['version'])),
+    ('_cluster_integrity', lambda data: data['cluster_integrity'] == 'true'),
+    ('_migrations', Extractors.sif_extractor('migrate_partitions_remaining')),
+    ('_uptime', Extractors.time_extractor('uptime')),
+)
+
+_NETWORK_ALERTS = (
+    ('_cluster_integrity', lambda data: data['cluster_integrity'] != 'true',
+     terminal.fg_red),
+)
+
+_NS_USAGE_SOURCES = (
+    ('_total_records', Extractors.sif_extractor(('_total_records'))),
+    ('_used_bytes_disk', Extractors.byte_extractor(
+        ('used-bytes-disk', 'device_used_bytes'))),
+    ('_used_bytes_memory', Extractors.byte_extractor(
+        ('used-bytes-memory', 'memory_used_bytes'))),
+    ('_index_type', lambda data: get_value_from_dict(
+        data, ('index-type'), default_value="shmem")),
+    ('_index_used_bytes', Extractors.byte_extractor(('index_used_bytes'))),
+    ('_used_disk_pct', lambda data: 100 - data['free_pct_disk']
+     if data['free_pct_disk'] != " " else " "),
+    ('_used_mem_pct', lambda data: 100 - data['free_pct_memory']
+     if data['free_pct_memory'] != " " else " "),
+)
+
+# Percentages compared by the usage alerts, coerced to int once in each
+# row's private copy of the namespace stats.
+_NS_USAGE_INT_FIELDS = (
+    'available_pct', 'free_pct_disk', 'free_pct_memory',
+    'high-water-disk-pct', 'high-water-memory-pct',
+)
+
+_NS_USAGE_ALERTS = (
+    ('available_pct', lambda data: data['available_pct'] != " " and
+     data['available_pct'] <= 10, terminal.fg_red),
+    ('stop_writes', lambda data: data['stop_writes'] != " " and
+     data['stop_writes'] != 'false', terminal.fg_red),
+    ('_used_mem_pct', lambda data: data['free_pct_memory'] != " " and
+     (100 - data['free_pct_memory']) >= data['high-water-memory-pct'],
+     terminal.fg_red),
+    ('_used_disk_pct', lambda data: data['free_pct_disk'] != " " and
+     (100 - data['free_pct_disk']) >= data['high-water-disk-pct'],
+     terminal.fg_red),
+)
+
+# Per record-type stats summed into a namespace's Total Records.
+_NS_USAGE_RECORD_FIELDS = (
+    ('master-objects', 'master_objects'), ('master_tombstones',),
+    ('prole-objects', 'prole_objects'), ('prole_tombstones',),
+    ('non-replica-objects', 'non_replica_objects'),
+    ('non_replica_tombstones',),
+)
+
+# (total key, stat keys) summed across nodes for the namespace totals row.
+_NS_USAGE_TOTAL_FIELDS = (
+    ('used-bytes-memory', ('used-bytes-memory', 'memory_used_bytes')),
+    ('used-bytes-disk', ('used-bytes-disk', 'device_used_bytes')),
+    ('evicted_objects', ('evicted-objects', 'evicted_objects')),
+    ('expired_objects', ('expired-objects', 'expired_objects')),
+    ('index_used_bytes', ('index_flash_used_bytes', 'index_pmem_used_bytes')),
+)
+
+_NS_USAGE_TOTAL_KEYS = ('_total_records',) + tuple(
+    total_key for total_key, _ in _NS_USAGE_TOTAL_FIELDS)
+
+_NS_OBJECT_SOURCES = (
+    ('_total_records', Extractors.sif_extractor('_total_records')),
+    ('_repl_factor', lambda data: get_value_from_dict(
+        data, ('effective_replication_factor',  # introduced post 3.15.0.1
+               'repl-factor',
+               'replication-factor'))),
+)
+
+_SET_SOURCES = (
+    ('_n-bytes-memory', Extractors.byte_extractor(
+        ('n-bytes-memory', 'memory_data_bytes'))),
+    ('_n_objects', Extractors.sif_extractor(('n_objects', 'objects'))),
+    ('_set-delete', lambda data: get_value_from_dict(
+        data, ('set-delete', 'deleting'))),
+)
+
+_XDR_SOURCES = (
+    ('_xdr-uptime', Extractors.time_extractor(('xdr-uptime', 'xdr_uptime'))),
+    ('_bytes-shipped', Extractors.byte_extractor(
+        ('esmt-bytes-shipped', 'esmt_bytes_shipped', 'xdr_ship_bytes'))),
+    ('_lag-secs', Extractors.time_extractor('xdr_timelag')),
+    ('_req-outstanding', Extractors.sif_extractor(
+        ('stat_recs_outstanding', 'xdr_ship_outstanding_objects'))),
+    ('_req-shipped-errors', Extractors.sif_extractor('stat_recs_ship_errors')),
+    ('_req-shipped-success', Extractors.sif_extractor(
+        ('stat_recs_shipped_ok', 'xdr_ship_success'))),
+    ('_cur_throughput', lambda data: get_value_from_dict(
+        data, ('cur_throughput', 'xdr_throughput'))),
+    ('_latency_avg_ship', lambda data: get_value_from_dict(
+        data, ('latency_avg_ship', 'xdr_ship_latency_avg'))),
+)
+
+_XDR_ALERTS = (
+    # Highlight red if lag is more than 30 seconds
+    ('_lag-secs', lambda data: int(data['xdr_timelag']) >= 300,
+     terminal.fg_red),
+)
+
+# (total key, stat keys) summed into Total Records and the totals row.
+_NS_OBJECT_RECORD_FIELDS = (
+    ('master_objects', ('master-objects', 'master_objects')),
+    ('master_tombstones', ('master_tombstones',)),
+    ('prole_objects', ('prole-objects', 'prole_objects')),
+    ('prole_tombstones', ('prole_tombstones',)),
+    ('non_replica_objects', ('non_replica_objects',)),
+    ('non_replica_tombstones', ('non_replica_tombstones',)),
+)
+
+_NS_OBJECT_MIGRATE_FIELDS = (
+    ('migrate_tx_partitions_remaining', ('migrate-tx-partitions-remaining',
+                                         'migrate_tx_partitions_remaining')),
+    ('migrate_rx_partitions_remaining', ('migrate-rx-partitions-remaining',
+                                         'migrate_rx_partitions_remaining')),
+)
+
+_NS_OBJECT_TOTAL_KEYS = ('_total_records',) + tuple(
+    total_key for total_key, _ in
+    _NS_OBJECT_RECORD_FIELDS + _NS_OBJECT_MIGRATE_FIELDS)
+
+_SET_TOTAL_FIELDS = (
+    ('n-bytes-memory', ('n-bytes-memory', 'memory_data_bytes')),
+    ('n_objects', ('n_objects', 'objects')),
+)
+
+_SET_TOTAL_KEYS = tuple(total_key for total_key, _ in _SET_TOTAL_FIELDS)
+
+_DC_SOURCES = (
+    ('_dc-name', lambda data: get_value_from_dict(
+        data, ('dc-name', 'DC_Name'))),
+    ('_xdr_dc_size', lambda data: get_value_from_dict(
+        data, ('xdr_dc_size', 'dc_size', 'dc_as_size',
+               'dc_http_good_locations'))),
+    ('_lag-secs', Extractors.time_extractor(
+        ('xdr-dc-timelag', 'xdr_dc_timelag', 'dc_timelag'))),
+    ('_xdr_dc_remote_ship_ok', lambda data: get_value_from_dict(
+        data, ('xdr_dc_remote_ship_ok', 'dc_remote_ship_ok',
+               'dc_recs_shipped_ok', 'dc_ship_success'))),
+    ('_latency_avg_ship_ema', lambda data: get_value_from_dict(
+        data, ('latency_avg_ship_ema', 'dc_latency_avg_ship',
+               'dc_latency_avg_ship_ema', 'dc_ship_latency_avg'))),
+    ('_xdr-dc-state', lambda data: get_value_from_dict(
+        data, ('xdr_dc_state', 'xdr-dc-state', 'dc_state'))),
+)
+
+_SINDEX_SOURCES = (
+    ('_bins', lambda data: get_value_from_dict(data, ('bins', 'bin'))),
+    ('_num_bins', lambda data: get_value_from_dict(
+        data, ('num_bins'), default_value=1)),
+    ('entries', Extractors.sif_extractor(('entries', 'objects'))),
+    ('_query_reqs', Extractors.sif_extractor(('query_reqs'))),
+    ('_stat_write_success', Extractors.sif_extractor(
+        ('stat_write_success', 'write_success'))),
+    ('_stat_delete_success', Extractors.sif_extractor(
+        ('stat_delete_success', 'delete_success'))),
+    ('_query_avg_rec_count', Extractors.sif_extractor(('query_avg_rec_count'))),
+)
+
+# Columns highlighted on the per namespace/set totals rows, which are
+# marked by a blank node.
+_NS_USAGE_TOTAL_COLUMNS = (
+    'namespace', '_total_records', '_used_bytes_memory', '_used_bytes_disk',
+    '_expired_and_evicted', '_index_used_bytes',
+)
+
+_NS_OBJECT_TOTAL_COLUMNS = (
+    'namespace', '_total_records', '_objects', '_tombstones', '_migrates',
+)
+
+_SET_TOTAL_COLUMNS = (
+    'set', 'namespace', '_n-bytes-memory', '_n_objects',
+)
+
+
+def _is_total_row(data):
+    return data['node'] == " "
+
+
+def _coerce_ints(row, keys):
+    for key in keys:
+        try:
+            row[key] = int(row[key])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+
+_principal_alerts = {}
+
+
+def _principal_alert(principal):
+    try:
+        return _principal_alerts[principal]
+    except KeyError:
+        # Bind principal as a default so each call reads a local, not a cell
+        alert = lambda data, _principal=principal: (
+            data['real_node_id'] == _principal)
+        _principal_alerts[principal] = alert
+        return alert
+
+
+_latency_column_entries = {}
+
+
+def _latency_columns(columns):
+    # Nodes report the same few histogram headers, so each header list is
+    # parsed once into (threshold, column) entries.
+    columns = tuple(columns)
+    try:
+        return _latency_column_entries[columns]
+    except KeyError:
+        entries = []
+        for column in columns:
+            if column[0] == '>':
+                c = int(column[1:-2])
+                entries.append((c, (column, "%%>%dMs" % c)))
+
+            elif column[0:2] == "%>":
+                c = int(column[2:-2])
+                entries.append((c, column))
+
+        _latency_column_entries[columns] = entries
+        return entries
+
 
 class CliView(object):
     NO_PAGER, LESS, MORE, SCROLL = range(4)
@@ -42,27 +284,34 @@ class CliView(object):
 
     @staticmethod
     def print_result(out):
-        if type(out) is not str:
+        if type(out) is list:
+            out = "".join(out)
+        elif type(out) is not str:
             out = str(out)
         if CliView.pager == CliView.LESS:
             pipepager(out, cmd='less -RSX')
         elif CliView.pager == CliView.SCROLL:
+            write = sys.stdout.write
             for i in out.split('\n'):
-                print i
+                write(i)
+                write('\n')
                 time.sleep(.05)
         else:
-            print out
+            # Write directly, print would also do softspace bookkeeping
+            sys.stdout.write(out)
+            sys.stdout.write('\n')
 
     @staticmethod
     def print_pager():
         if CliView.pager == CliView.LESS:
-            print "LESS"
+            pager = "LESS"
         elif CliView.pager == CliView.MORE:
-            print "MORE"
+            pager = "MORE"
         elif CliView.pager == CliView.SCROLL:
-            print "SCROLL"
+            pager = "SCROLL"
         else:
-            print "NO PAGER"
+            pager = "NO PAGER"
+        sys.stdout.write(pager + '\n')
 
     @staticmethod
     def _get_timestamp_suffix(timestamp):
@@ -88,21 +337,15 @@ class CliView(object):
 
         t = Table(title, column_names, group_by=0, sort_by=1)
 
-        t.add_data_source('Enterprise', lambda data: 'N/E' if data['version'] == 'N/E' else(
-            True if "Enterprise" in data['version'] else False))
-        t.add_data_source('_cluster_integrity', lambda data:
-                          True if row['cluster_integrity'] == 'true' else False)
-        t.add_data_source('_migrations',
-                          Extractors.sif_extractor('migrate_partitions_remaining'))
-        t.add_data_source('_uptime', Extractors.time_extractor('uptime'))
+        t.add_data_sources(_NETWORK_SOURCES)
+        t.add_cell_alerts(_NETWORK_ALERTS)
 
-        t.add_cell_alert('node_id', lambda data: data[
-                         'real_node_id'] == principal, color=terminal.fg_green)
-        t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
-        t.add_cell_alert(
-            '_cluster_integrity', lambda data: data['cluster_integrity'] != 'true')
+        is_principal = _principal_alert(principal)
+        t.add_cell_alert('node_id', is_principal, color=terminal.fg_green)
+        t.add_cell_alert('node', is_principal, color=terminal.fg_green)
 
+        # Nodes normally agree on the principal, resolve it once.
+        paxos_node_ids = {}
         for node_key, n_stats in stats.iteritems():
             if isinstance(n_stats, Exception):
                 n_stats = {}
@@ -115,16 +358,17 @@ class CliView(object):
             row['node_id'] = node.node_id if node.node_id != principal else "*%s" % (
                 node.node_id)
 
-            try:
-                paxos_node = cluster.get_node(row['paxos_principal'])[0]
-                row['_paxos_principal'] = paxos_node.node_id
-            except KeyError:
-                # The principal is a node we currently do not know about
-                # So return the principal ID
-                try:
-                    row['_paxos_principal'] = row['paxos_principal']
-                except KeyError:
-                    pass
+            if 'paxos_principal' in row:
+                paxos_principal = row['paxos_principal']
+                if paxos_principal not in paxos_node_ids:
+                    try:
+                        paxos_node_ids[paxos_principal] = cluster.get_node(
+                            paxos_principal)[0].node_id
+                    except KeyError:
+                        # The principal is a node we currently do not know about
+                        # So return the principal ID
+                        paxos_node_ids[paxos_principal] = paxos_principal
+                row['_paxos_principal'] = paxos_node_ids[paxos_principal]
             try:
                 build = builds[node_key]
                 if not isinstance(build, Exception):
@@ -176,61 +420,27 @@ class CliView(object):
 
         t = Table(title, column_names, sort_by=0)
 
-        t.add_data_source('_total_records', Extractors.sif_extractor(
-            ('_total_records')))
+        t.add_data_sources(_NS_USAGE_SOURCES)
         t.add_data_source_tuple(
             '_expired_and_evicted',
             Extractors.sif_extractor(('expired-objects', 'expired_objects')),
             Extractors.sif_extractor(('evicted-objects', 'evicted_objects')))
-        t.add_data_source('_used_bytes_disk', Extractors.byte_extractor(
-            ('used-bytes-disk', 'device_used_bytes')))
-        t.add_data_source('_used_bytes_memory', Extractors.byte_extractor(
-            ('used-bytes-memory', 'memory_used_bytes')))
-
-        t.add_data_source('_index_type',
-            lambda data: get_value_from_dict( data, ('index-type'), default_value="shmem"))
-        t.add_data_source('_index_used_bytes',
-            Extractors.byte_extractor(('index_used_bytes')))
-
-        t.add_data_source('_used_disk_pct', lambda data: 100 -
-                          int(data['free_pct_disk']) if data['free_pct_disk'] is not " " else " ")
-
-        t.add_data_source('_used_mem_pct', lambda data: 100 - int(
-            data['free_pct_memory']) if data['free_pct_memory'] is not " " else " ")
-
-        t.add_cell_alert('available_pct', lambda data: data['available_pct'] != " " and int(data['available_pct']) <= 10)
-
-        t.add_cell_alert('stop_writes', lambda data: data['stop_writes'] != " " and data['stop_writes'] != 'false')
 
-        t.add_cell_alert('_used_mem_pct', lambda data: data['free_pct_memory'] != " " and (100 - int(data['free_pct_memory'])) >= int(data['high-water-memory-pct']))
-
-        t.add_cell_alert('_used_disk_pct', lambda data: data['free_pct_disk'] != " " and (100 - int(data['free_pct_disk'])) >= int(data['high-water-disk-pct']))
+        t.add_cell_alerts(_NS_USAGE_ALERTS)
 
         t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
+            'node', _principal_alert(principal), color=terminal.fg_green)
 
-        t.add_cell_alert(
-            'namespace', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_total_records', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_used_bytes_memory', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_used_bytes_disk', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_expired_and_evicted', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert('_index_used_bytes', lambda data: data['node'] is " ", color=terminal.fg_blue)
+        t.add_cell_alerts(
+            (column, _is_total_row, terminal.fg_blue) for column in _NS_USAGE_TOTAL_COLUMNS)
 
-        total_res = {}
+        total_res = defaultdict(lambda: dict.fromkeys(_NS_USAGE_TOTAL_KEYS, 0))
 
         # Need to maintain Node column ascending order per namespace.
         # If set sort_by in table, it will affect total rows. TODO: implement group_by
         # So we need to add rows as Nodes ascending order. So need to sort
         # stats.keys as per respective Node value (prefixes[node_key]).
-        node_key_list = stats.keys()
-        node_column_list = [prefixes[key] for key in node_key_list]
-        sorted_node_list = [x for (y, x) in sorted(
-            zip(node_column_list, node_key_list), key=lambda pair: pair[0])]
+        sorted_node_list = sorted(stats.iterkeys(), key=prefixes.__getitem__)
 
         for node_key in sorted_node_list:
             n_stats = stats[node_key]
@@ -245,83 +455,24 @@ class CliView(object):
                 if isinstance(ns_stats, Exception):
                     row = {}
                 else:
-                    row = ns_stats
+                    # Copy, the percentages below are coerced to int in place
+                    # and ns_stats is shared with other consumers.
+                    row = dict(ns_stats)
 
                 _total_records = 0
 
-                if ns not in total_res:
-                    total_res[ns] = {}
-                    total_res[ns]["_total_records"] = 0
-                    total_res[ns]["used-bytes-memory"] = 0
-                    total_res[ns]["used-bytes-disk"] = 0
-                    total_res[ns]["evicted_objects"] = 0
-                    total_res[ns]["expired_objects"] = 0
-                    total_res[ns]["index_used_bytes"] = 0
-
-                try:
-                    _total_records += get_value_from_dict(
-                        ns_stats, ('master-objects', 'master_objects'),
-                        default_value=0, return_type=int)
-                except Exception:
-                    pass
-                try:
-                    _total_records += get_value_from_dict(
-                        ns_stats, ('master_tombstones'), default_value=0, return_type=int)
-                except Exception:
-                    pass
-
-                try:
-                    _total_records += get_value_from_dict(
-                        ns_stats, ('prole-objects', 'prole_objects'), default_value=0,
-                        return_type=int)
-                except Exception:
-                    pass
-                try:
-                    _total_records += get_value_from_dict(
-                        ns_stats, ('prole_tombstones'), default_value=0, return_type=int)
-                except Exception:
-                    pass
-
-                try:
-                    _total_records += get_value_from_dict(
-                        ns_stats, ('non-replica-objects', 'non_replica_objects'),
-                        default_value=0, return_type=int)
-                except Exception:
-                    pass
-                try:
-                    _total_records += get_value_from_dict(
-                        ns_stats, ('non_replica_tombstones'), default_value=0, return_type=int)
-                except Exception:
-                    pass
-
-                try:
-                    total_res[ns]["used-bytes-memory"] += get_value_from_dict(
-                        ns_stats, ('used-bytes-memory', 'memory_used_bytes'), return_type=int)
-                except Exception:
-                    pass
-                try:
-                    total_res[ns]["used-bytes-disk"] += get_value_from_dict(
-                        ns_stats, ('used-bytes-disk', 'device_used_bytes'), return_type=int)
-                except Exception:
-                    pass
-
-                try:
-                    total_res[ns]["evicted_objects"] += get_value_from_dict(
-                        ns_stats, ('evicted-objects', 'evicted_objects'), return_type=int)
-                except Exception:
-                    pass
-
-                try:
-                    total_res[ns]["expired_objects"] += get_value_from_dict(
-                        ns_stats, ('expired-objects', 'expired_objects'), return_type=int)
-                except Exception:
-                    pass
+                for keys in _NS_USAGE_RECORD_FIELDS:
+                    value = get_value_from_dict(
+                        row, keys, default_value=0, return_type=int)
+                    if value:
+                        _total_records += value
 
-                try:
-                    total_res[ns]["index_used_bytes"] += get_value_from_dict(
-                        ns_stats, ('index_flash_used_bytes', 'index_pmem_used_bytes'), default_value=0, return_type=int)
-                except Exception:
-                    pass
+                ns_total = total_res[ns]
+                for total_key, keys in _NS_USAGE_TOTAL_FIELDS:
+                    value = get_value_from_dict(
+                        row, keys, default_value=0, return_type=int)
+                    if value:
+                        ns_total[total_key] += value
 
                 row['namespace'] = ns
                 row['real_node_id'] = node.node_id
@@ -331,6 +482,7 @@ class CliView(object):
                 set_value_in_dict(row, "free_pct_memory", get_value_from_dict(row, ('free-pct-memory', 'memory_free_pct')))
                 set_value_in_dict(row, "stop_writes", get_value_from_dict(row, ('stop-writes', 'stop_writes')))
                 set_value_in_dict(row, "_total_records", _total_records)
+                _coerce_ints(row, _NS_USAGE_INT_FIELDS)
 
                 total_res[ns]["_total_records"] += _total_records
 
@@ -386,17 +538,7 @@ class CliView(object):
 
         t = Table(title, column_names, sort_by=0)
 
-        t.add_data_source(
-            '_total_records',
-            Extractors.sif_extractor('_total_records'))
-
-        t.add_data_source(
-            '_repl_factor',
-            lambda data: get_value_from_dict(
-                data, ('effective_replication_factor',  # introduced post 3.15.0.1
-                       'repl-factor',
-                       'replication-factor')
-            ))
+        t.add_data_sources(_NS_OBJECT_SOURCES)
 
         t.add_data_source_tuple(
             '_objects',
@@ -420,29 +562,18 @@ class CliView(object):
                                       'migrate-rx-partitions-remaining')))
 
         t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
+            'node', _principal_alert(principal), color=terminal.fg_green)
 
-        t.add_cell_alert(
-            'namespace', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_total_records', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_objects', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_tombstones', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_migrates', lambda data: data['node'] is " ", color=terminal.fg_blue)
+        t.add_cell_alerts(
+            (column, _is_total_row, terminal.fg_blue) for column in _NS_OBJECT_TOTAL_COLUMNS)
 
-        total_res = {}
+        total_res = defaultdict(lambda: dict.fromkeys(_NS_OBJECT_TOTAL_KEYS, 0))
 
         # Need to maintain Node column ascending order per namespace.
         # If set sort_by in table, it will affect total rows.
         # So we need to add rows as Nodes ascending order. So need to sort
         # stats.keys as per respective Node value (prefixes[node_key]).
-        node_key_list = stats.keys()
-        node_column_list = [prefixes[key] for key in node_key_list]
-        sorted_node_list = [x for (y, x) in sorted(
-            zip(node_column_list, node_key_list), key=lambda pair: pair[0])]
+        sorted_node_list = sorted(stats.iterkeys(), key=prefixes.__getitem__)
 
         rack_id_available = False
 
@@ -459,107 +590,42 @@ class CliView(object):
                     row = {}
                 else:
                     row = ns_stats
-                    ns_stats['_total_records'] = 0
-
-                if ns not in total_res:
-                    total_res[ns] = {}
-                    total_res[ns]["_total_records"] = 0
-                    total_res[ns]["master_objects"] = 0
-                    total_res[ns]["master_tombstones"] = 0
-                    total_res[ns]["prole_objects"] = 0
-                    total_res[ns]["prole_tombstones"] = 0
-                    total_res[ns]["non_replica_objects"] = 0
-                    total_res[ns]["non_replica_tombstones"] = 0
-                    total_res[ns]["migrate_tx_partitions_remaining"] = 0
-                    total_res[ns]["migrate_rx_partitions_remaining"] = 0
 
                 if "rack-id" in row:
                     rack_id_available = True
 
-                try:
+                ns_total = total_res[ns]
+                _total_records = 0
+                for total_key, keys in _NS_OBJECT_RECORD_FIELDS:
                     value = get_value_from_dict(
-                        ns_stats, ('master-objects', 'master_objects'), return_type=int)
-                    total_res[ns]["master_objects"] += value
-                    ns_stats['_total_records'] += value
-                except Exception:
-                    pass
-
-                try:
-                    value = get_value_from_dict(ns_stats, ('master_tombstones'), return_type=int)
-                    total_res[ns]["master_tombstones"] += value
-                    ns_stats['_total_records'] += value
-                except Exception:
-                    pass
+                        row, keys, default_value=0, return_type=int)
+                    if value:
+                        ns_total[total_key] += value
+                        _total_records += value
 
-                try:
+                for total_key, keys in _NS_OBJECT_MIGRATE_FIELDS:
                     value = get_value_from_dict(
-                        ns_stats, ('prole-objects', 'prole_objects'), return_type=int)
-                    total_res[ns]["prole_objects"] += value
-                    ns_stats['_total_records'] += value
-                except Exception:
-                    pass
-
-                try:
-                    value = get_value_from_dict(ns_stats, ('prole_tombstones'), return_type=int)
-                    total_res[ns]["prole_tombstones"] += value
-                    ns_stats['_total_records'] += value
-                except Exception:
-                    pass
-
-                try:
-                    value = get_value_from_dict(
-                        ns_stats, ('non_replica_objects'), return_type=int)
-                    total_res[ns]["non_replica_objects"] += value
-                    ns_stats['_total_records'] += value
-                except Exception:
-                    pass
-
-                try:
-                    value = get_value_from_dict(ns_stats, ('non_replica_tombstones'), return_type=int)
-                    total_res[ns]["non_replica_tombstones"] += value
-                    ns_stats['_total_records'] += value
-                except Exception:
-                    pass
-
-                try:
-                    total_res[ns]["migrate_tx_partitions_remaining"] += get_value_from_dict(
-                        ns_stats, ('migrate-tx-partitions-remaining',
-                                   'migrate_tx_partitions_remaining'), return_type=int)
-                except Exception:
-                    pass
-
-                try:
-                    total_res[ns]["migrate_rx_partitions_remaining"] += get_value_from_dict(
-                        ns_stats, ('migrate-rx-partitions-remaining',
-                                   'migrate_rx_partitions_remaining'), return_type=int)
-                except Exception:
-                    pass
+                        row, keys, default_value=0, return_type=int)
+                    if value:
+                        ns_total[total_key] += value
 
                 if not isinstance(ns_stats, Exception):
-                    total_res[ns]['_total_records'] += ns_stats['_total_records']
+                    row['_total_records'] = _total_records
+                    ns_total['_total_records'] += _total_records
 
                 row['namespace'] = ns
                 row['real_node_id'] = node.node_id
                 row['node'] = prefixes[node_key]
                 t.insert_row(row)
 
-        for ns in total_res:
+        for ns, ns_total in total_res.iteritems():
             row = {}
-            row['node'] = " "
+            for total_key, value in ns_total.iteritems():
+                row[total_key] = str(value)
 
+            row['node'] = " "
             row['namespace'] = ns
-            row["_total_records"] = str(total_res[ns]["_total_records"])
             row["repl-factor"] = " "
-            row["master_objects"] = str(total_res[ns]["master_objects"])
-            row["master_tombstones"] = str(total_res[ns]["master_tombstones"])
-            row["prole_objects"] = str(total_res[ns]["prole_objects"])
-            row["prole_tombstones"] = str(total_res[ns]["prole_tombstones"])
-            row["non_replica_objects"] = str(total_res[ns]["non_replica_objects"])
-            row["non_replica_tombstones"] = str(total_res[ns]["non_replica_tombstones"])
-            row["migrate_tx_partitions_remaining"] = str(
-                total_res[ns]["migrate_tx_partitions_remaining"])
-            row["migrate_rx_partitions_remaining"] = str(
-                total_res[ns]["migrate_rx_partitions_remaining"])
 
             if rack_id_available:
                 row["rack-id"] = " "
@@ -579,35 +645,20 @@ class CliView(object):
                         )
 
         t = Table(title, column_names, sort_by=1, group_by=0)
-        t.add_data_source(
-            '_n-bytes-memory', Extractors.byte_extractor(('n-bytes-memory', 'memory_data_bytes')))
-        t.add_data_source(
-            '_n_objects', Extractors.sif_extractor(('n_objects', 'objects')))
-
-        t.add_data_source(
-            '_set-delete', lambda data: get_value_from_dict(data, ('set-delete', 'deleting')))
+        t.add_data_sources(_SET_SOURCES)
 
         t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
+            'node', _principal_alert(principal), color=terminal.fg_green)
 
-        t.add_cell_alert(
-            'set', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            'namespace', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_n-bytes-memory', lambda data: data['node'] is " ", color=terminal.fg_blue)
-        t.add_cell_alert(
-            '_n_objects', lambda data: data['node'] is " ", color=terminal.fg_blue)
+        t.add_cell_alerts(
+            (column, _is_total_row, terminal.fg_blue) for column in _SET_TOTAL_COLUMNS)
 
-        total_res = {}
+        total_res = defaultdict(lambda: dict.fromkeys(_SET_TOTAL_KEYS, 0))
 
         # Need to maintain Node column ascending order per <set,namespace>. If set sort_by in table, it will affect total rows.
         # So we need to add rows as Nodes ascending order. So need to sort
         # stats.keys as per respective Node value (prefixes[node_key]).
-        node_key_list = stats.keys()
-        node_column_list = [prefixes[key] for key in node_key_list]
-        sorted_node_list = [x for (y, x) in sorted(
-            zip(node_column_list, node_key_list), key=lambda pair: pair[0])]
+        sorted_node_list = sorted(stats.iterkeys(), key=prefixes.__getitem__)
 
         for node_key in sorted_node_list:
             s_stats = stats[node_key]
@@ -623,20 +674,11 @@ class CliView(object):
                 else:
                     row = set_stats
 
-                if (ns, set) not in total_res:
-                    total_res[(ns, set)] = {}
-                    total_res[(ns, set)]["n-bytes-memory"] = 0
-                    total_res[(ns, set)]["n_objects"] = 0
-                try:
-                    total_res[(ns, set)]["n-bytes-memory"] += get_value_from_dict(
-                        set_stats, ('n-bytes-memory', 'memory_data_bytes'), 0, int)
-                except Exception:
-                    pass
-                try:
-                    total_res[(ns, set)][
-                        "n_objects"] += get_value_from_dict(set_stats, ('n_objects', 'objects'), 0, int)
-                except Exception:
-                    pass
+                set_total = total_res[(ns, set)]
+                for total_key, keys in _SET_TOTAL_FIELDS:
+                    value = get_value_from_dict(row, keys, 0, int)
+                    if value:
+                        set_total[total_key] += value
 
                 row['set'] = set
                 row['namespace'] = ns
@@ -663,7 +705,7 @@ class CliView(object):
 
     @staticmethod
     def info_XDR(stats, builds, xdr_enable, cluster, timestamp="", **ignore):
-        if not max(xdr_enable.itervalues()):
+        if not any(xdr_enable.itervalues()):
             return
 
         prefixes = cluster.get_node_names()
@@ -676,37 +718,11 @@ class CliView(object):
 
         t = Table(title, column_names, group_by=1)
 
-        t.add_data_source('_xdr-uptime', Extractors.time_extractor(
-            ('xdr-uptime', 'xdr_uptime')))
-
-        t.add_data_source('_bytes-shipped',
-                          Extractors.byte_extractor(
-                              ('esmt-bytes-shipped', 'esmt_bytes_shipped', 'xdr_ship_bytes')))
-
-        t.add_data_source('_lag-secs',
-                          Extractors.time_extractor('xdr_timelag'))
-
-        t.add_data_source('_req-outstanding',
-                          Extractors.sif_extractor(('stat_recs_outstanding', 'xdr_ship_outstanding_objects')))
-
-        t.add_data_source('_req-shipped-errors',
-                          Extractors.sif_extractor('stat_recs_ship_errors'))
+        t.add_data_sources(_XDR_SOURCES)
+        t.add_cell_alerts(_XDR_ALERTS)
 
-        t.add_data_source('_req-shipped-success',
-                          Extractors.sif_extractor(('stat_recs_shipped_ok', 'xdr_ship_success')))
-
-        t.add_data_source('_cur_throughput',
-                          lambda data: get_value_from_dict(data, ('cur_throughput', 'xdr_throughput')))
-
-        t.add_data_source('_latency_avg_ship',
-                          lambda data: get_value_from_dict(data, ('latency_avg_ship', 'xdr_ship_latency_avg')))
-
-        # Highlight red if lag is more than 30 seconds
         t.add_cell_alert(
-            '_lag-secs', lambda data: int(data['xdr_timelag']) >= 300)
-
-        t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
+            'node', _principal_alert(principal), color=terminal.fg_green)
 
         row = None
         for node_key, row in stats.iteritems():
@@ -758,26 +774,10 @@ class CliView(object):
 
         t = Table(title, column_names, group_by=1)
 
-        t.add_data_source(
-            '_dc-name', lambda data: get_value_from_dict(data, ('dc-name', 'DC_Name')))
-
-        t.add_data_source('_xdr_dc_size', lambda data: get_value_from_dict(
-            data, ('xdr_dc_size', 'dc_size', 'dc_as_size', 'dc_http_good_locations')))
-
-        t.add_data_source(
-            '_lag-secs', Extractors.time_extractor(('xdr-dc-timelag', 'xdr_dc_timelag', 'dc_timelag')))
-
-        t.add_data_source('_xdr_dc_remote_ship_ok', lambda data: get_value_from_dict(
-            data, ('xdr_dc_remote_ship_ok', 'dc_remote_ship_ok', 'dc_recs_shipped_ok', 'dc_ship_success')))
-
-        t.add_data_source('_latency_avg_ship_ema', lambda data: get_value_from_dict(
-            data, ('latency_avg_ship_ema', 'dc_latency_avg_ship', 'dc_latency_avg_ship_ema', 'dc_ship_latency_avg')))
-
-        t.add_data_source('_xdr-dc-state', lambda data:
-                          get_value_from_dict(data, ('xdr_dc_state', 'xdr-dc-state', 'dc_state')))
+        t.add_data_sources(_DC_SOURCES)
 
         t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
+            'node', _principal_alert(principal), color=terminal.fg_green)
 
         row = None
         for node_key, dc_stats in stats.iteritems():
@@ -804,30 +804,19 @@ class CliView(object):
                         'state', 'sync_state', 'keys', 'entries', 'si_accounted_memory', ('_query_reqs', 'q'), ('_stat_write_success', 'w'), ('_stat_delete_success', 'd'), ('_query_avg_rec_count', 's'))
 
         t = Table(title, column_names, group_by=1, sort_by=2)
-        t.add_data_source(
-            '_bins', lambda data: get_value_from_dict(data, ('bins', 'bin')))
-        t.add_data_source('_num_bins', lambda data: get_value_from_dict(
-            data, ('num_bins'), default_value=1))
-        t.add_data_source(
-            'entries', Extractors.sif_extractor(('entries', 'objects')))
-        t.add_data_source(
-            '_query_reqs', Extractors.sif_extractor(('query_reqs')))
-        t.add_data_source('_stat_write_success', Extractors.sif_extractor(
-            ('stat_write_success', 'write_success')))
-        t.add_data_source('_stat_delete_success', Extractors.sif_extractor(
-            ('stat_delete_success', 'delete_success')))
-        t.add_data_source(
-            '_query_avg_rec_count', Extractors.sif_extractor(('query_avg_rec_count')))
+        t.add_data_sources(_SINDEX_SOURCES)
         t.add_cell_alert(
-            'node', lambda data: data['real_node_id'] == principal, color=terminal.fg_green)
-        for stat in stats.values():
+            'node', _principal_alert(principal), color=terminal.fg_green)
+        node_ids = {}
+        for stat in stats.itervalues():
             for node_key, n_stats in stat.iteritems():
-                node = cluster.get_node(node_key)[0]
+                if node_key not in node_ids:
+                    node_ids[node_key] = cluster.get_node(node_key)[0].node_id
                 if isinstance(n_stats, Exception):
                     row = {}
                 else:
                     row = n_stats
-                row['real_node_id'] = node.node_id
+                row['real_node_id'] = node_ids[node_key]
                 row['node'] = prefixes[node_key]
                 t.insert_row(row)
 
@@ -838,6 +827,7 @@ class CliView(object):
         if not summary or len(summary.strip()) == 0:
             return
         if title:
+            # Printed directly, so it stays ahead of any pager.
             print "************************** %s **************************" % (title)
         CliView.print_result(summary)
 
@@ -847,35 +837,37 @@ class CliView(object):
 
         likes = compile_likes(like)
 
-        columns = ["%s%%" % (n) for n in xrange(10, 110, 10)]
-        percentages = columns[:]
-        columns.insert(0, 'node')
+        percentages = ["%s%%" % (n) for n in xrange(10, 110, 10)]
+        columns = ['node'] + percentages
 
         title_suffix = CliView._get_timestamp_suffix(timestamp)
         description = "Percentage of records having %s less than or " % (hist) + \
                       "equal to value measured in %s" % (unit)
 
-        namespaces = set(filter(likes.search, histogram.keys()))
-
         for namespace, node_data in histogram.iteritems():
-            if namespace not in namespaces or not node_data or isinstance(node_data, Exception):
+            if not likes.search(namespace) or not node_data or isinstance(node_data, Exception):
                 continue
 
             t = Table("%s - %s in %s%s" % (namespace, title, unit,
                                            title_suffix), columns, description=description)
-            for node_id, data in node_data.iteritems():
-                if not data or isinstance(data, Exception):
-                    continue
+            t.insert_rows(CliView._distribution_rows(
+                node_data, percentages, prefixes))
 
-                percentiles = data['percentiles']
-                row = {}
-                row['node'] = prefixes[node_id]
-                for percent in percentages:
-                    row[percent] = percentiles.pop(0)
+            CliView.print_result(t)
 
-                t.insert_row(row)
+    @staticmethod
+    def _distribution_rows(node_data, percentages, prefixes):
+        for node_id, data in node_data.iteritems():
+            if not data or isinstance(data, Exception):
+                continue
 
-            CliView.print_result(t)
+            percentiles = data['percentiles']
+            row = {}
+            row['node'] = prefixes[node_id]
+            for percent in percentages:
+                row[percent] = percentiles.pop(0)
+
+            yield row
 
     @staticmethod
     def show_object_distribution(title, histogram, unit, hist, bucket_count, set_bucket_count, cluster, like=None, timestamp="", loganalyser_mode=False, **ignore):
@@ -887,23 +879,20 @@ class CliView(object):
         description = "Number of records having %s in the range " % (hist) + \
                       "measured in %s" % (unit)
 
-        namespaces = set(filter(likes.search, histogram.keys()))
-
         for namespace, node_data in histogram.iteritems():
-            if namespace not in namespaces:
+            if not likes.search(namespace):
                 continue
-            columns = []
+            columns = ['node']
             for column in node_data["columns"]:
                 # Tuple is required to give specific column display name,
                 # otherwise it will print same column name but in title_format
                 # (ex. KB -> Kb)
                 columns.append((column, column))
-            columns.insert(0, 'node')
             t = Table("%s - %s in %s%s" % (namespace, title, unit,
                                            title_suffix), columns, description=description)
             if not loganalyser_mode:
                 for column in columns:
-                    if column is not 'node':
+                    if column != 'node':
                         t.add_data_source(
                             column, Extractors.sif_extractor(column))
 
@@ -924,14 +913,7 @@ class CliView(object):
         if not data or "columns" not in data or not data["columns"]:
             return
 
-        for column in data["columns"]:
-            if column[0] == '>':
-                c = int(column[1:-2])
-                all_columns.add((c,(column, "%%>%dMs"%c)))
-
-            elif column[0:2] == "%>":
-                c = int(column[2:-2])
-                all_columns.add((c, column))
+        all_columns.update(_latency_columns(data["columns"]))
 
     @staticmethod
     def _create_latency_row(data, ns=" "):
@@ -952,30 +934,22 @@ class CliView(object):
     def show_latency(latency, cluster, machine_wise_display=False, show_ns_details=False, like=None, timestamp="", **ignore):
         prefixes = cluster.get_node_names()
 
-        if like:
-            likes = compile_likes(like)
-
-        if not machine_wise_display:
-            if like:
-                histograms = set(filter(likes.search, latency.keys()))
-            else:
-                histograms = set(latency.keys())
+        likes = compile_likes(like) if like else None
+        # Histograms are filtered at the top level, or per machine when
+        # machine_wise_display flips the nesting.
+        hist_likes = likes if not machine_wise_display else None
+        node_hist_likes = likes if machine_wise_display else None
 
         title_suffix = CliView._get_timestamp_suffix(timestamp)
 
         for hist_or_node, data in sorted(latency.iteritems()):
-            if not machine_wise_display and hist_or_node not in histograms:
+            if hist_likes and not hist_likes.search(hist_or_node):
                 continue
             title = "%s Latency%s" % (hist_or_node, title_suffix)
 
-            if machine_wise_display:
-                if like:
-                    histograms = set(filter(likes.search, data.keys()))
-                else:
-                    histograms = set(data.keys())
             all_columns = set()
             for node_or_hist_id, _data in data.iteritems():
-                if machine_wise_display and node_or_hist_id not in histograms:
+                if node_hist_likes and not node_hist_likes.search(node_or_hist_id):
                     continue
 
                 for _type, _type_data in _data.iteritems():
@@ -989,26 +963,26 @@ class CliView(object):
                         for ns, ns_data in _type_data.iteritems():
                             CliView._update_latency_column_list(ns_data, all_columns=all_columns)
 
-            all_columns = [c[1] for c in sorted(all_columns, key=lambda c:c[0])]
-            all_columns.insert(0, 'ops/sec')
-            all_columns.insert(0, 'Time Span')
-            if show_ns_details:
-                all_columns.insert(0, 'namespace')
             if machine_wise_display:
-                all_columns.insert(0, 'histogram')
+                leading_columns = ['histogram']
             else:
-                all_columns.insert(0, 'node')
+                leading_columns = ['node']
+            if show_ns_details:
+                leading_columns.append('namespace')
+            leading_columns.extend(('Time Span', 'ops/sec'))
+            all_columns = leading_columns + [
+                c[1] for c in sorted(all_columns, key=lambda c:c[0])]
 
             t = Table(title, all_columns)
             if show_ns_details:
                 for c in all_columns:
                     t.add_cell_alert(
-                        c, lambda data: data['namespace'] is " ", color=terminal.fg_blue)
+                        c, lambda data: data['namespace'] == " ", color=terminal.fg_blue)
             for node_or_hist_id, _data in data.iteritems():
-                if machine_wise_display and node_or_hist_id not in histograms:
+                if node_hist_likes and not node_hist_likes.search(node_or_hist_id):
                     continue
 
-                for _type in sorted(_data.keys()):
+                for _type in sorted(_data):
                     if _type == "namespace" and not show_ns_details:
                         continue
 
@@ -1040,30 +1014,28 @@ class CliView(object):
         column_names = set()
 
         if diff and service_configs:
-            config_sets = (set(service_configs[d].iteritems())
-                           for d in service_configs if service_configs[d])
+            config_sets = [set(config.iteritems())
+                           for config in service_configs.itervalues() if config]
             union = set.union(*config_sets)
-            # Regenerating generator expression for config_sets.
-            config_sets = (set(service_configs[d].iteritems())
-                           for d in service_configs if service_configs[d])
             intersection = set.intersection(*config_sets)
-            column_names = dict(union - intersection).keys()
+            column_names = set(
+                key for key, _ in union.difference(intersection))
         else:
             for config in service_configs.itervalues():
                 if isinstance(config, Exception):
                     continue
                 column_names.update(config.keys())
 
-        column_names = sorted(column_names)
         if like:
             likes = compile_likes(like)
+            column_names = [c for c in column_names if likes.search(c)]
 
-            column_names = filter(likes.search, column_names)
+        column_names = sorted(column_names)
 
         if len(column_names) == 0:
             return ''
 
-        column_names.insert(0, "NODE")
+        column_names = ["NODE"] + column_names
 
         table_style = Styles.VERTICAL
         if flip_output:
@@ -1082,6 +1054,9 @@ class CliView(object):
         row = None
         if show_total:
             row_total = {}
+            # Only displayed columns can show a total, skip the rest of
+            # each config.
+            total_columns = column_names[1:]
         for node_id, row in service_configs.iteritems():
             if isinstance(row, Exception):
                 row = {}
@@ -1090,12 +1065,10 @@ class CliView(object):
             t.insert_row(row)
 
             if show_total:
-                for key, val in row.iteritems():
-                    if (val.isdigit()):
-                        try:
-                            row_total[key] = row_total[key] + int(val)
-                        except Exception:
-                            row_total[key] = int(val)
+                for key in total_columns:
+                    val = row.get(key)
+                    if val and val.isdigit():
+                        row_total[key] = row_total.get(key, 0) + int(val)
         if show_total:
             row_total['NODE'] = "Total"
             t.insert_row(row_total)
@@ -1106,28 +1079,27 @@ class CliView(object):
     @staticmethod
     def show_grep_count(title, grep_result, title_every_nth=0, like=None, diff=None, **ignore):
         column_names = set()
-        if grep_result:
-            if grep_result[grep_result.keys()[0]]:
-                column_names = CliView._sort_list_with_string_and_datetime(
-                    grep_result[grep_result.keys()[0]][COUNT_RESULT_KEY].keys())
+        files = sorted(grep_result.iterkeys()) if grep_result else []
+        first = grep_result[files[0]] if files else None
+        if first:
+            column_names = CliView._sort_list_with_string_and_datetime(
+                first[COUNT_RESULT_KEY].keys())
 
         if len(column_names) == 0:
             return ''
 
-        column_names.insert(0, "NODE")
+        column_names = ["NODE"] + column_names
 
         t = Table(title, column_names,
                   title_format=TitleFormats.no_change, style=Styles.VERTICAL)
 
-        for file in sorted(grep_result.keys()):
+        for file in files:
             if isinstance(grep_result[file], Exception):
                 row1 = {}
                 row2 = {}
             else:
                 row1 = grep_result[file]["count_result"]
-                row2 = {}
-                for key in grep_result[file]["count_result"].keys():
-                    row2[key] = "|"
+                row2 = dict.fromkeys(row1, "|")
 
             row1['NODE'] = file
 
@@ -1146,9 +1118,11 @@ class CliView(object):
         column_names = set()
         different_writer_info = False
 
-        if grep_result and grep_result[grep_result.keys()[0]]:
-            if "diff_end" in grep_result[grep_result.keys()[0]]["value"]:
-                for _k in grep_result.keys():
+        files = sorted(grep_result.iterkeys()) if grep_result else []
+        first = grep_result[files[0]] if files else None
+        if first:
+            if "diff_end" in first["value"]:
+                for _k in files:
                     try:
                         if grep_result[_k]["value"]["diff_end"]:
                             different_writer_info = True
@@ -1157,18 +1131,17 @@ class CliView(object):
                         continue
 
             column_names = CliView._sort_list_with_string_and_datetime(
-                grep_result[grep_result.keys()[0]]["value"].keys())
+                first["value"].keys())
 
         if len(column_names) == 0:
             return ''
 
-        column_names.insert(0, ".")
-        column_names.insert(0, "NODE")
+        column_names = ["NODE", "."] + column_names
 
         t = Table(title, column_names,
                   title_format=TitleFormats.no_change, style=Styles.VERTICAL)
 
-        for file in sorted(grep_result.keys()):
+        for file in files:
             if isinstance(grep_result[file], Exception):
                 row1 = {}
                 row2 = {}
@@ -1176,9 +1149,7 @@ class CliView(object):
             else:
                 row1 = grep_result[file]["value"]
                 row2 = grep_result[file]["diff"]
-                row3 = {}
-                for key in grep_result[file]["value"].keys():
-                    row3[key] = "|"
+                row3 = dict.fromkeys(row1, "|")
 
             row1['NODE'] = file
             row1['.'] = "Total"
@@ -1205,24 +1176,22 @@ class CliView(object):
         if not keys:
             return keys
         dt_list = []
-        remove_list = []
+        str_list = []
+        is_dt_key = _DT_KEY.match
+        strptime = datetime.datetime.strptime
         for key in keys:
             try:
-                dt_list.append(datetime.datetime.strptime(key, DT_FMT))
-                remove_list.append(key)
+                if is_dt_key(key):
+                    dt_list.append(strptime(key, DT_FMT))
+                    continue
             except Exception:
                 pass
-        for rm_key in remove_list:
-            keys.remove(rm_key)
-        if keys:
-            keys = sorted(keys)
-        if dt_list:
-            dt_list = [k.strftime(DT_FMT) for k in sorted(dt_list)]
-        if keys and not dt_list:
-            return keys
-        if dt_list and not keys:
-            return dt_list
-        dt_list.extend(keys)
+            str_list.append(key)
+        str_list.sort()
+        if not dt_list:
+            return str_list
+        dt_list = [k.strftime(DT_FMT) for k in sorted(dt_list)]
+        dt_list.extend(str_list)
         return dt_list
 
     @staticmethod
@@ -1230,23 +1199,23 @@ class CliView(object):
         column_names = set()
         tps_key = ("ops/sec", None)
 
-        if grep_result:
-            # find column names
-            if grep_result[grep_result.keys()[0]]:
-                column_names = CliView._sort_list_with_string_and_datetime(
-                    grep_result[grep_result.keys()[0]][tps_key].keys())
+        files = sorted(grep_result.iterkeys()) if grep_result else []
+        first = grep_result[files[0]] if files else None
+        # find column names
+        if first:
+            column_names = CliView._sort_list_with_string_and_datetime(
+                first[tps_key].keys())
 
         if len(column_names) == 0:
             return ''
-        column_names.insert(0, ".")
-        column_names.insert(0, "NODE")
+        column_names = ["NODE", "."] + column_names
 
         t = Table(title, column_names,
                   title_format=TitleFormats.no_change, style=Styles.VERTICAL)
 
         row = None
         sub_columns_per_column = 0
-        for file in sorted(grep_result.keys()):
+        for file in files:
             if isinstance(grep_result[file], Exception):
                 continue
             else:
@@ -1284,9 +1253,7 @@ class CliView(object):
                     row['.'] = stat[0]
                     t.insert_row(row)
 
-                row = {}
-                for key in grep_result[file][tps_key].keys():
-                    row[key] = "|"
+                row = dict.fromkeys(grep_result[file][tps_key], "|")
 
                 row['NODE'] = "|"
                 row['.'] = "|"
@@ -1306,9 +1273,7 @@ class CliView(object):
         if not mapping:
             return
 
-        column_names = []
-        column_names.insert(0, col2)
-        column_names.insert(0, col1)
+        column_names = [col1, col2]
 
         title_suffix = CliView._get_timestamp_suffix(timestamp)
         t = Table("%s to %s Mapping%s" % (col1, col2, title_suffix), column_names,
@@ -1337,14 +1302,17 @@ class CliView(object):
 
     @staticmethod
     def asinfo(results, line_sep, show_node_name, cluster, **kwargs):
-        like = set([])
-        if 'like' in kwargs:
-            like = set(kwargs['like'])
+        likes = None
+        if kwargs.get('like'):
+            likes = compile_likes(kwargs['like'])
+
+        if show_node_name:
+            prefixes = cluster.get_node_names()
 
         for node_id, value in results.iteritems():
 
             if show_node_name:
-                prefix = cluster.get_node_names()[node_id]
+                prefix = prefixes[node_id]
                 node = cluster.get_node(node_id)[0]
                 print "%s%s (%s) returned%s:" % (terminal.bold(), prefix, node.ip, terminal.reset())
 
@@ -1353,17 +1321,19 @@ class CliView(object):
                 print "\n"
             else:
                 if isinstance(value, types.StringType):
-                    delimiter = find_delimiter_in(value)
-                    value = value.split(delimiter)
+                    # Splitting and rejoining on the same delimiter is a
+                    # no-op, only do it when filtering or re-separating.
+                    if likes or line_sep:
+                        delimiter = find_delimiter_in(value)
+                        value = value.split(delimiter)
 
-                    if like:
-                        likes = compile_likes(like)
-                        value = filter(likes.search, value)
+                        if likes:
+                            value = filter(likes.search, value)
 
-                    if line_sep:
-                        value = "\n".join(value)
-                    else:
-                        value = delimiter.join(value)
+                        if line_sep:
+                            value = "\n".join(value)
+                        else:
+                            value = delimiter.join(value)
 
                     print value
                     if show_node_name:
@@ -1379,30 +1349,19 @@ class CliView(object):
 
     @staticmethod
     def group_output(output):
-        i = 0
-        while i < len(output):
-            group = output[i]
-
-            if group == '\033':
-                i += 1
-                while i < len(output):
-                    group = group + output[i]
-                    if output[i] == 'm':
-                        i += 1
-                        break
-                    i += 1
-                yield group
-                continue
-            else:
-                yield group
-                i += 1
+        # Whole escape sequences and single characters otherwise.
+        return _OUTPUT_GROUP.findall(output)
 
     @staticmethod
-    def peekable(peeked, remaining):
-        for val in remaining:
-            while peeked:
-                yield peeked.pop(0)
-            yield val
+    def _get_watch_header(line, sleep, count, num_iterations):
+        ts = time.time()
+        st = datetime.datetime.fromtimestamp(
+            ts).strftime(' %Y-%m-%d %H:%M:%S')
+        command = " ".join(line)
+        if num_iterations:
+            count = "%s  of %s" % (count, num_iterations)
+        return "[%s '%s' sleep: %ss iteration: %s ]\n" % (
+            st, command, sleep, count)
 
     @staticmethod
     def watch(ctrl, line):
@@ -1431,70 +1390,93 @@ class CliView(object):
 
         try:
             real_stdout = sys.stdout
-            sys.stdout = mystdout = StringIO()
+            if diff_highlight:
+                sys.stdout = mystdout = StringIO()
             previous = None
             count = 1
             while True:
+                if not diff_highlight:
+                    # Nothing to compare, stream the command's output as is.
+                    real_stdout.write(CliView._get_watch_header(
+                        line, sleep, count, num_iterations))
+                    ctrl.execute(line[:])
+                    real_stdout.write('\n')
+                    real_stdout.flush()
+
+                    if num_iterations and num_iterations <= count:
+                        break
+
+                    count += 1
+                    time.sleep(sleep)
+                    continue
+
                 highlight = False
                 ctrl.execute(line[:])
                 output = mystdout.getvalue()
-                mystdout.truncate(0)
-                mystdout.seek(0)
+                sys.stdout = mystdout = StringIO()
 
-                if previous and diff_highlight:
+                if previous:
                     result = []
-                    prev_iterator = CliView.group_output(previous)
-                    next_peeked = []
-                    next_iterator = CliView.group_output(output)
-                    next_iterator = CliView.peekable(
-                        next_peeked, next_iterator)
-
-                    for prev_group in prev_iterator:
+                    append = result.append
+                    prev_groups = CliView.group_output(previous)
+                    next_groups = CliView.group_output(output)
+                    next_count = len(next_groups)
+                    i = 0
+                    # Nothing else changes the terminal format during this
+                    # pass, so both escape strings stay fixed.
+                    inverse = terminal.inverse()
+                    uninverse = terminal.uninverse()
+
+                    for prev_group in prev_groups:
                         if '\033' in prev_group:
                             # skip prev escape seq
                             continue
 
-                        for next_group in next_iterator:
+                        while i < next_count:
+                            next_group = next_groups[i]
                             if '\033' in next_group:
                                 # add current escape seq
-                                result += next_group
+                                append(next_group)
+                                i += 1
                                 continue
                             elif next_group == '\n':
                                 if prev_group != '\n':
-                                    next_peeked.append(next_group)
+                                    # hold the newline until prev reaches
+                                    # the end of its line
                                     break
                                 if highlight:
-                                    result += terminal.uninverse()
+                                    append(uninverse)
                                     highlight = False
                             elif prev_group == next_group:
                                 if highlight:
-                                    result += terminal.uninverse()
+                                    append(uninverse)
                                     highlight = False
                             else:
                                 if not highlight:
-                                    result += terminal.inverse()
+                                    append(inverse)
                                     highlight = True
 
-                            result += next_group
+                            append(next_group)
+                            i += 1
 
                             if '\n' == prev_group and '\n' != next_group:
                                 continue
                             break
 
-                    for next_group in next_iterator:
+                    for next_group in itertools.islice(next_groups, i, None):
                         if next_group == ' ' or next_group == '\n':
                             if highlight:
-                                result += terminal.uninverse()
+                                append(uninverse)
                                 highlight = False
                         else:
                             if not highlight:
-                                result += terminal.inverse()
+                                append(inverse)
                                 highlight = True
 
-                        result += next_group
+                        append(next_group)
 
                     if highlight:
-                        result += terminal.reset()
+                        append(terminal.reset())
                         highlight = False
 
                     result = "".join(result)
@@ -1503,16 +1485,9 @@ class CliView(object):
                     result = output
                     previous = output
 
-                ts = time.time()
-                st = datetime.datetime.fromtimestamp(
-                    ts).strftime(' %Y-%m-%d %H:%M:%S')
-                command = " ".join(line)
-                print >> real_stdout, "[%s '%s' sleep: %ss iteration: %s" % (
-                    st, command, sleep, count),
-                if num_iterations:
-                    print >> real_stdout, " of %s" % (num_iterations),
-                print >> real_stdout, "]"
-                print >> real_stdout, result
+                real_stdout.write("%s%s\n" % (CliView._get_watch_header(
+                    line, sleep, count, num_iterations), result))
+                real_stdout.flush()
 
                 if num_iterations and num_iterations <= count:
                     break
@@ -1692,58 +1667,43 @@ class CliView(object):
     def _get_error_string(data, verbose=False, level=AssertLevel.CRITICAL):
         if not data:
             return "", 0
-        f_msg_str = ""
+        f_msgs = []
         f_msg_cnt = 0
-        s_msg_str = ""
+        s_msgs = []
         s_msg_cnt = 0
 
         for d in data:
-            s = ""
-
             if d[AssertResultKey.LEVEL] == level:
 
                 if d[AssertResultKey.SUCCESS]:
                     if d[AssertResultKey.SUCCESS_MSG]:
 
-                        s_msg_str += CliView._get_header(d[AssertResultKey.CATEGORY][0]) + \
-                            CliView._get_msg([d[AssertResultKey.SUCCESS_MSG]])
+                        s_msgs.append(CliView._get_header(d[AssertResultKey.CATEGORY][0]))
+                        s_msgs.append(CliView._get_msg([d[AssertResultKey.SUCCESS_MSG]]))
                         s_msg_cnt += 1
                     continue
 
-                s += CliView._get_header(d[AssertResultKey.CATEGORY][0]) + \
-                    CliView._get_msg([d[AssertResultKey.FAIL_MSG]], level)
+                f_msgs.append(CliView._get_header(d[AssertResultKey.CATEGORY][0]))
+                f_msgs.append(CliView._get_msg([d[AssertResultKey.FAIL_MSG]], level))
 
                 if verbose:
                     import textwrap
 
-                    s += "\n"
-                    s += CliView._get_header("Description:")
-                    s += CliView._get_msg(textwrap.wrap(str(d[AssertResultKey.DESCRIPTION]), H_width - H2_offset,
-                                                       break_long_words=False, break_on_hyphens=False))
+                    f_msgs.append("\n")
+                    f_msgs.append(CliView._get_header("Description:"))
+                    f_msgs.append(CliView._get_msg(textwrap.wrap(str(d[AssertResultKey.DESCRIPTION]), H_width - H2_offset,
+                                                                break_long_words=False, break_on_hyphens=False)))
 
-                    s += "\n"
-                    s += CliView._get_header("Keys:")
-                    s += CliView._get_msg(CliView._get_kv_msg_list(d[AssertResultKey.KEYS]))
+                    f_msgs.append("\n")
+                    f_msgs.append(CliView._get_header("Keys:"))
+                    f_msgs.append(CliView._get_msg(CliView._get_kv_msg_list(d[AssertResultKey.KEYS])))
 
                     # Extra new line in case verbose output is printed
-                    s += "\n"
+                    f_msgs.append("\n")
 
-                f_msg_str += s
                 f_msg_cnt += 1
 
-        res_fail_msg_str = ""
-        if f_msg_cnt > 0:
-            res_fail_msg_str += f_msg_str
-
-        res_success_msg_str = ""
-
-        if s_msg_cnt > 0:
-            # res_success_msg_str = "\n\n"
-            # res_success_msg_str += (".".join(data[0]
-            #                         [AssertResultKey.CATEGORY]) + ":").ljust(25) + ""
-            res_success_msg_str += s_msg_str
-
-        return res_fail_msg_str, f_msg_cnt, res_success_msg_str, s_msg_cnt
+        return "".join(f_msgs), f_msg_cnt, "".join(s_msgs), s_msg_cnt
 
     @staticmethod
     def _get_assert_output_string(assert_out, verbose=False, output_filter_category=[], level=AssertLevel.CRITICAL):
@@ -1751,16 +1711,16 @@ class CliView(object):
         if not assert_out:
             return ""
 
-        res_fail_msg_str = ""
+        res_fail_msgs = []
         total_fail_msg_cnt = 0
-        res_success_msg_str = ""
+        res_success_msgs = []
         total_success_msg_cnt = 0
 
         if not isinstance(assert_out, dict):
             if not output_filter_category:
                 return CliView._get_error_string(assert_out, verbose, level=level)
         else:
-            for _k in sorted(assert_out.keys()):
+            for _k in sorted(assert_out):
                 category = []
 
                 if output_filter_category:
@@ -1773,12 +1733,12 @@ class CliView(object):
                 f_msg_str, f_msg_cnt, s_msg_str, s_msg_cnt = CliView._get_assert_output_string(
                     assert_out[_k], verbose, category, level=level)
 
-                res_fail_msg_str += f_msg_str
+                res_fail_msgs.append(f_msg_str)
                 total_fail_msg_cnt += f_msg_cnt
-                res_success_msg_str += s_msg_str
+                res_success_msgs.append(s_msg_str)
                 total_success_msg_cnt += s_msg_cnt
 
-        return res_fail_msg_str, total_fail_msg_cnt, res_success_msg_str, total_success_msg_cnt
+        return "".join(res_fail_msgs), total_fail_msg_cnt, "".join(res_success_msgs), total_success_msg_cnt
 
     @staticmethod
     def _print_assert_summary(assert_out, verbose=False, output_filter_category=[], output_filter_warning_level=None):
@@ -1794,18 +1754,18 @@ class CliView(object):
         else:
             search_levels = [AssertLevel.INFO, AssertLevel.WARNING, AssertLevel.CRITICAL]
 
-        all_success_str = ""
-        all_fail_str = ""
+        all_success_msgs = []
+        all_fail_msgs = []
         all_fail_cnt = 0
         all_success_cnt = 0
 
         for level in search_levels:
-            res_fail_msg_str = ""
+            res_fail_msgs = []
             total_fail_msg_cnt = 0
-            res_success_msg_str = ""
+            res_success_msgs = []
             total_success_msg_cnt = 0
 
-            for _k in sorted(assert_out.keys()):
+            for _k in sorted(assert_out):
                 if not assert_out[_k]:
                     continue
                 category = []
@@ -1820,11 +1780,11 @@ class CliView(object):
                     assert_out[_k], verbose, category, level=level)
                 if f_msg_str:
                     total_fail_msg_cnt += f_msg_cnt
-                    res_fail_msg_str += f_msg_str
+                    res_fail_msgs.append(f_msg_str)
 
                 if s_msg_str:
                     total_success_msg_cnt += s_msg_cnt
-                    res_success_msg_str += s_msg_str
+                    res_success_msgs.append(s_msg_str)
 
             if total_fail_msg_cnt > 0:
                 summary_str = ""
@@ -1838,20 +1798,24 @@ class CliView(object):
                     summary_str = terminal.bold() + terminal.fg_green() + str("%s" %
                                                             ("INFO")).center(H_width, " ") + terminal.fg_clear() + terminal.unbold()
 
-                all_fail_str += "\n" + summary_str + "\n" + res_fail_msg_str + "\n"
+                all_fail_msgs.append("\n")
+                all_fail_msgs.append(summary_str)
+                all_fail_msgs.append("\n")
+                all_fail_msgs.extend(res_fail_msgs)
+                all_fail_msgs.append("\n")
                 all_fail_cnt += total_fail_msg_cnt
 
             if total_success_msg_cnt > 0:
-                all_success_str += res_success_msg_str
+                all_success_msgs.extend(res_success_msgs)
                 all_success_cnt += total_success_msg_cnt
 
         if all_success_cnt > 0:
             print "\n\n" + terminal.bold() + str(" %s: count(%d) " %("PASS", all_success_cnt)).center(H_width, "_") + terminal.unbold()
-            print all_success_str
+            print "".join(all_success_msgs)
 
         if all_fail_cnt > 0:
             print "\n\n" + terminal.bold() + str(" %s: count(%d) " %("FAIL", all_fail_cnt)).center(H_width, "_") + terminal.unbold()
-            print all_fail_str
+            print "".join(all_fail_msgs)
 
         print "_" * H_width + "\n"
 
@@ -2090,16 +2054,18 @@ class CliView(object):
                         ('unavailable_partitions', 'Unavailable Partitions'),
                         )
         t = Table(title, column_names, group_by=0, sort_by=1)
+        t.insert_rows(CliView._pmap_rows(pmap_data, prefixes))
 
+        CliView.print_result(t)
+
+    @staticmethod
+    def _pmap_rows(pmap_data, prefixes):
         for node_key, n_stats in pmap_data.iteritems():
+            node_name = prefixes[node_key]
 
             for ns, ns_stats in n_stats.iteritems():
-                row = ns_stats
-                row['node'] = prefixes[node_key]
-                row['namespace'] = ns
-                row['_primary_partitions'] = ns_stats['master_partition_count']
-                row['_secondary_partitions'] = ns_stats['prole_partition_count']
-
-                t.insert_row(row)
-
-        CliView.print_result(t)
+                # Fresh row per namespace, pmap_data is left untouched.
+                yield dict(
+                    ns_stats, node=node_name, namespace=ns,
+                    _primary_partitions=ns_stats['master_partition_count'],
+                    _secondary_partitions=ns_stats['prole_partition_count'])
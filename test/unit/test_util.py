@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import unittest2 as unittest
+import threading
 import time
 
 from lib.utils import timeout
@@ -27,6 +28,22 @@ class UtilTest(unittest.TestCase):
         value = ":".join(value.split(";"))
         result = util.info_to_dict(value, ':')
         self.assertEqual(result, expected)
+        value = "a=1;b=2=3;a=0;c"
+        expected = {'a':'0,1', 'b':'2=3'}
+        result = util.info_to_dict(value)
+        self.assertEqual(result, expected)
+
+    def test_info_to_dict_multi_level(self):
+        value = "ns=test:a=1:b=2;ns=bar:a=3;a=4"
+        expected = {'test': {'ns':'test', 'a':'1', 'b':'2'}, 'bar': {'ns':'bar', 'a':'3'}}
+        result = util.info_to_dict_multi_level(value, "ns")
+        self.assertEqual(result, expected)
+        value = "dc-name=DC1:nodes=1.1.1.1:3000;DC_Name=DC2:nodes=2.2.2.2:3000"
+        expected = {'DC1': {'dc-name':'DC1', 'nodes':'1.1.1.1:3000'},
+                    'DC2': {'DC_Name':'DC2', 'nodes':'2.2.2.2:3000'}}
+        result = util.info_to_dict_multi_level(value, ["dc-name", "DC_Name"],
+                                               ignore_field_without_key_value_delimiter=False)
+        self.assertEqual(result, expected)
 
     def test_info_colon_to_dict(self):
         value = "a=1:b=@:c=c:d=1@"
@@ -42,6 +59,9 @@ class UtilTest(unittest.TestCase):
         value = "a=1:b=@:c=c:d=1@"
         result = util.info_to_list(value, ':')
         self.assertEqual(result, expected)
+        value = "a=1;b=@:c=c;d=1@"
+        result = util.info_to_list(value, '[;:]')
+        self.assertEqual(result, expected)
 
     def test_info_to_tuple(self):
         value = "a=1;b=@;c=c;d=1@"
@@ -52,12 +72,85 @@ class UtilTest(unittest.TestCase):
         result = util.info_to_tuple(value)
         self.assertEqual(result, expected)
 
+    def test_parse_peers_string(self):
+        value = "2,3000,[[BB9050011AC4202,,[172.17.0.5]],[BB9070011AC4202,tls1,[172.17.0.7:3100,[2001:db8::1]:3100]]]"
+        expected = ['2', '3000', '[[BB9050011AC4202,,[172.17.0.5]],[BB9070011AC4202,tls1,[172.17.0.7:3100,[2001:db8::1]:3100]]]']
+        result = util.parse_peers_string(value)
+        self.assertEqual(result, expected)
+        value = "[2001:db8::1]:3000"
+        expected = ['[2001:db8::1]', '3000']
+        result = util.parse_peers_string(value, delim=":")
+        self.assertEqual(result, expected)
+        value = "[172.17.0.5, 172.17.0.6]"
+        expected = ['172.17.0.5', '172.17.0.6']
+        result = util.parse_peers_string(value)
+        self.assertEqual(result, expected)
+        value = "172.17.0.5:3000"
+        expected = ['172.17.0.5', '3000']
+        result = util.parse_peers_string(value, delim=":")
+        self.assertEqual(result, expected)
+        self.assertEqual(util.parse_peers_string("a,b,"), ['a', 'b'])
+        self.assertEqual(util.parse_peers_string(""), [])
+
+    def test_find_dns(self):
+        self.assertEqual(util.find_dns(None), None)
+        self.assertEqual(util.find_dns(["", "172.17.0.5:3000", "[2001:db8::1]:3000"]), None)
+        self.assertEqual(util.find_dns(["172.17.0.5:3000", "host.example.com:3000"]), "host.example.com")
+        self.assertEqual(util.find_dns(["host.example.com "]), "host.example.com")
+
+    def test_flatten(self):
+        a = ('172.17.0.5', 3000, None)
+        b = ('172.17.0.6', 3000, None)
+        c = ('172.17.0.7', 3000, None)
+        self.assertEqual(util.flatten([]), [])
+        self.assertEqual(util.flatten([(a, b), (c,)]), [a, b, c])
+        self.assertEqual(util.flatten([a, b]), [a, b])
+        self.assertEqual(util.flatten([(a, b), c]), [a, b, c])
+
+    def test_get_value_from_dict(self):
+        d = {'a': '1', 'b': None, 'c': 'x'}
+        self.assertEqual(util.get_value_from_dict(d, 'a'), '1')
+        self.assertEqual(util.get_value_from_dict(d, ('z', 'a'), return_type=int), 1)
+        self.assertEqual(util.get_value_from_dict(d, ('b', 'a')), None)
+        self.assertEqual(util.get_value_from_dict(d, 'c', return_type=int), 'x')
+        self.assertEqual(util.get_value_from_dict(d, ('y', 'z'), default_value=0), 0)
+        self.assertEqual(util.get_value_from_dict(d, 'z', default_value=0), 0)
+        self.assertEqual(util.get_value_from_dict(d, (), default_value=0), 0)
+
     def test_concurrent_map(self):
         value = range(10)
         expected = map(lambda v: v*v, value)
         result = util.concurrent_map(lambda v: v*v, value)
         self.assertEqual(result, expected)
 
+        value = [1, 0, 2]
+        expected = [10, None, 5]
+        with self.assertLogs('asadm', level='ERROR') as logs:
+            result = util.concurrent_map(lambda v: 10 / v, value)
+        self.assertEqual(result, expected)
+        self.assertEqual(len(logs.records), 1)
+
+        value = range(100)
+        expected = map(lambda v: v*v, value)
+        result = util.concurrent_map(lambda v: v*v, value)
+        self.assertEqual(result, expected)
+
+        self.assertEqual(util.concurrent_map(lambda v: v*v, []), [])
+        self.assertEqual(util.concurrent_map(lambda v: v*v, [3]), [9])
+
+    def test_concurrent_map_overlap(self):
+        started = []
+        all_started = threading.Event()
+        def tester(v):
+            started.append(v)
+            if len(started) == 64:
+                all_started.set()
+            # Only returns True once every call is running at the same time.
+            return all_started.wait(5.0)
+
+        result = util.concurrent_map(tester, range(64))
+        self.assertEqual(result, [True] * 64)
+
     def test_cached(self):
         def tester(arg1, arg2, sleep):
             time.sleep(sleep)
@@ -75,3 +168,52 @@ class UtilTest(unittest.TestCase):
         self.assertEqual(4, tester(2,2,0.2))
         self.assertEqual(5, tester(3,2,0.2))
         self.assertRaises(timeout.TimeoutException, tester, 1, 2, 5)
+
+    def test_cached_failure(self):
+        calls = []
+        def tester(arg):
+            calls.append(arg)
+            raise IOError("failed %s" % (arg))
+
+        tester = util.cached(tester, ttl=5.0)
+
+        self.assertRaises(IOError, tester, 1)
+        self.assertRaises(IOError, tester, 1)
+        self.assertEqual(calls, [1])
+        self.assertRaises(IOError, tester, 2)
+        self.assertEqual(calls, [1, 2])
+
+    def test_cached_forget_failures(self):
+        calls = []
+        def tester(arg):
+            calls.append(arg)
+            raise IOError("failed %s" % (arg))
+
+        tester = util.cached(tester, ttl=5.0)
+        first = object()
+        second = object()
+
+        self.assertRaises(IOError, tester, first)
+        self.assertRaises(IOError, tester, second)
+        util.forget_failures(first)
+        self.assertRaises(IOError, tester, first)
+        self.assertRaises(IOError, tester, second)
+        self.assertEqual(calls, [first, second, first])
+
+    def test_cached_min_cost(self):
+        calls = []
+        def tester(arg):
+            calls.append(arg)
+            return arg
+
+        tester = util.cached(tester, ttl=5.0, min_cost=5.0)
+
+        self.assertEqual(1, tester(1))
+        self.assertEqual(1, tester(1))
+        self.assertEqual(calls, [1, 1])
+
+    def test_shell_command(self):
+        out, err = util.shell_command(["echo 'a b' | tr a c"])
+        self.assertEqual(out, "c b\n")
+        out, err = util.shell_command(["echo", "a | b"], shell=False)
+        self.assertEqual(out, "a | b\n")